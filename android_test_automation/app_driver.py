@@ -3,6 +3,7 @@ Appium Driver Setup and Management for Android App Testing
 """
 
 import logging
+from typing import Optional
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.common.appiumby import AppiumBy
@@ -36,21 +37,37 @@ logger = logging.getLogger(__name__)
 class AppDriver:
     """Manages Appium driver connection and basic app interactions"""
     
-    def __init__(self):
+    def __init__(self, udid: Optional[str] = None):
+        """
+        Args:
+            udid: Device to connect to (defaults to DEVICE_CONFIG["udid"])
+        """
+        self.udid = udid or DEVICE_CONFIG["udid"]
         self.driver = None
         self.wait = None
     
     def start_driver(self):
-        """Initialize and start the Appium driver"""
+        """
+        Initialize and start the Appium driver
+        
+        The session's command executor keeps a keep-alive connection pool to
+        the Appium server, so every RPC in the run reuses it. Calling this
+        again while a session is open reuses that session instead of
+        opening a new one.
+        """
+        if self.driver is not None:
+            logger.info(f"Reusing existing Appium session for {self.udid}")
+            return True
+        
         try:
-            logger.info("Initializing Appium driver...")
+            logger.info(f"Initializing Appium driver for {self.udid}...")
             
             # Create UiAutomator2Options
             options = UiAutomator2Options()
             options.platform_name = DEVICE_CONFIG["platformName"]
             options.platform_version = DEVICE_CONFIG["platformVersion"]
             options.device_name = DEVICE_CONFIG["deviceName"]
-            options.udid = DEVICE_CONFIG["udid"]
+            options.udid = self.udid
             options.automation_name = DEVICE_CONFIG["automationName"]
             options.app_package = DEVICE_CONFIG["appPackage"]
             options.app_activity = DEVICE_CONFIG["appActivity"]
@@ -84,6 +101,9 @@ class AppDriver:
                 logger.info("Appium driver closed successfully")
         except Exception as e:
             logger.error(f"Error closing driver: {str(e)}")
+        finally:
+            self.driver = None
+            self.wait = None
     
     def find_element_safe(self, locator, by=AppiumBy.XPATH, timeout=ELEMENT_WAIT):
         """Safely find an element with timeout"""
@@ -148,6 +168,14 @@ class AppDriver:
             logger.error(f"Failed to take screenshot: {str(e)}")
             return False
     
+    def get_screenshot_png(self):
+        """Take a screenshot and return the raw PNG bytes without writing a file"""
+        try:
+            return self.driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.error(f"Failed to take screenshot: {str(e)}")
+            return None
+    
     def get_page_source(self):
         """Get the current page source (XML)"""
         try:
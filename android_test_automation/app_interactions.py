@@ -4,17 +4,58 @@ Handles navigation, image upload, and result extraction
 """
 
 import logging
+import re
 import time
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
 import subprocess
 import os
+import hashlib
+import threading
 
 from app_driver import AppDriver
-from config import SELECTORS, IMAGE_UPLOAD_METHOD
+from config import SELECTORS, IMAGE_UPLOAD_METHOD, IMPLICIT_WAIT
 
 logger = logging.getLogger(__name__)
 
+# Text shown while the scan is still in progress
+STILL_SCANNING_TEXT = ["Finalizing profile", "Finalizing", "Scanning"]
+
+# Text showing a scan has started (image was selected); "Processing" only
+# shows briefly at the start, so it doesn't count as still scanning
+SCANNING_STARTED_TEXT = STILL_SCANNING_TEXT + ["Processing"]
+
+# Text shown once the result screen appeared (has "Dragonfly", "No Insect Detected", or species name)
+RESULT_SCREEN_TEXT = [
+    "Dragonfly",
+    "species of",
+    "Damselfly",
+    "No Insect",  # Covers "No Insect Detected", the exact text on the "No Insect" screen
+    "No insect detected",
+    "No insect visible",
+    "Tips for Better Photos",  # Appears on "No Insect Detected" screen
+]
+
+
+def contains_any_xpath(keywords):
+    """XPath matching elements whose text or content-desc contains any keyword"""
+    return "//*[" + " or ".join(
+        f"contains(@text, '{kw}') or contains(@content-desc, '{kw}')" for kw in keywords
+    ) + "]"
+
+
+def keyword_alternation(keywords):
+    """Regex alternation matching any keyword literally"""
+    return "|".join(map(re.escape, keywords))
+
+
+# Server-side queries: the device returns only matching elements
+STILL_SCANNING_XPATH = contains_any_xpath(STILL_SCANNING_TEXT)
+RESULT_SCREEN_XPATH = contains_any_xpath(RESULT_SCREEN_TEXT)
+
+# Page source fallbacks, for when the XPath query itself is rejected
+STILL_SCANNING_PATTERN = re.compile(keyword_alternation(STILL_SCANNING_TEXT))
+RESULT_SCREEN_PATTERN = re.compile(keyword_alternation(RESULT_SCREEN_TEXT))
 
 class AppInteractions:
     """Handles specific interactions with the AI Insect Bug Identifier app"""
@@ -22,9 +63,12 @@ class AppInteractions:
     def __init__(self, driver: AppDriver):
         self.driver = driver
         self.app_package = "com.janogroupllc.pdfphotos"
-        # Get device ID from config
-        from config import DEVICE_CONFIG
-        self.device_id = DEVICE_CONFIG.get("udid", "emulator-5554")
+        # adb commands target the same device as the Appium session
+        self.device_id = driver.udid
+        # Device paths already holding their image this session; push_image is
+        # called from the prefetch pool and the test thread, so guard it
+        self._pushed_images = set()
+        self._pushed_lock = threading.Lock()
     
     def handle_permissions(self):
         """Handle app permissions - FAST CHECK ONLY"""
@@ -321,23 +365,54 @@ class AppInteractions:
             logger.error(f"Error opening gallery: {str(e)}")
             return False
     
+    @staticmethod
+    def device_path_for(image_path):
+        """
+        Device path an image is copied to
+        
+        A short hash of the local path is appended to the file stem, so files
+        from different directories that share a basename never overwrite each
+        other on the device (e.g. while a prefetch runs during a scan).
+        """
+        stem, ext = os.path.splitext(os.path.basename(image_path))
+        tag = hashlib.blake2s(os.path.abspath(image_path).encode(), digest_size=4).hexdigest()
+        return f"/sdcard/Download/{stem}_{tag}{ext}"
+    
+    def push_image(self, image_path):
+        """
+        Copy an image to the device's Download folder (once per session)
+        
+        Returns:
+            Path of the image on the device
+        """
+        device_path = self.device_path_for(image_path)
+        
+        with self._pushed_lock:
+            if device_path in self._pushed_images:
+                return device_path
+        
+        subprocess.run(
+            ["adb", "-s", self.device_id, "push", image_path, device_path],
+            check=True,
+            capture_output=True
+        )
+        with self._pushed_lock:
+            self._pushed_images.add(device_path)
+        logger.info(f"Image copied to device: {device_path}")
+        
+        return device_path
+    
     def select_image_from_gallery(self, image_path):
         """Select an image from the device gallery - matches image name from test case"""
         try:
             logger.info(f"Selecting image: {image_path}")
             
-            # First, copy image to device if needed
-            image_name = os.path.basename(image_path)
-            device_path = f"/sdcard/Download/{image_name}"
+            # First, copy image to device if needed (the gallery shows the device file name)
+            image_name = os.path.basename(self.device_path_for(image_path))
             
             # Copy image to device using adb
             try:
-                subprocess.run(
-                    ["adb", "-s", self.device_id, "push", image_path, device_path],
-                    check=True,
-                    capture_output=True
-                )
-                logger.info(f"Image copied to device: {device_path}")
+                self.push_image(image_path)
             except Exception as e:
                 logger.warning(f"Could not copy image via adb: {str(e)}")
             
@@ -433,15 +508,8 @@ class AppInteractions:
             # Ensure app is running first
             self.ensure_app_running()
             
-            # Copy image to device
-            image_name = os.path.basename(image_path)
-            device_path = f"/sdcard/Download/{image_name}"
-            
-            subprocess.run(
-                ["adb", "-s", self.device_id, "push", image_path, device_path],
-                check=True,
-                capture_output=True
-            )
+            # Copy image to device (skipped if it was pre-copied)
+            device_path = self.push_image(image_path)
             
             # Use adb to open the image with the app
             # Format: package/activity (not just activity)
@@ -517,15 +585,8 @@ class AppInteractions:
             logger.info("Waiting for image scanning to complete...")
             
             # Wait for scanning screen to appear
-            scanning_indicators = [
-                "Finalizing profile",
-                "Finalizing",
-                "Scanning",
-                "Processing",
-            ]
-            
             scanning_found = False
-            for indicator in scanning_indicators:
+            for indicator in SCANNING_STARTED_TEXT:
                 if self.driver.element_exists(f"//*[contains(@text, '{indicator}')]", timeout=3):
                     scanning_found = True
                     logger.info(f"✓ Found scanning indicator: {indicator}")
@@ -536,34 +597,12 @@ class AppInteractions:
                 return True
             
             # Wait for scanning to complete (progress disappears or result screen appears)
-            start_time = time.time()
-            while time.time() - start_time < max_wait:
-                page_source = self.driver.get_page_source()
-                if page_source:
-                    # Check if scanning is still in progress
-                    still_scanning = any(
-                        indicator in page_source 
-                        for indicator in ["Finalizing profile", "Finalizing", "Scanning"]
-                    )
-                    
-                    # Check if result screen appeared (has "Dragonfly", "No Insect Detected", or species name)
-                    result_appeared = any(
-                        keyword in page_source 
-                        for keyword in [
-                            "Dragonfly", 
-                            "species of", 
-                            "Damselfly",
-                            "No Insect Detected",  # Exact text from "No Insect" screen
-                            "No insect detected",
-                            "No insect visible",
-                            "Tips for Better Photos",  # Appears on "No Insect Detected" screen
-                        ]
-                    )
-                    
-                    if not still_scanning or result_appeared:
-                        logger.info("✓ Scanning completed")
-                        time.sleep(1)  # Brief wait for UI to settle
-                        return True
+            deadline = time.monotonic() + max_wait
+            while time.monotonic() < deadline:
+                if self._scanning_finished():
+                    logger.info("✓ Scanning completed")
+                    time.sleep(1)  # Brief wait for UI to settle
+                    return True
                 
                 time.sleep(1)  # Check every second
             
@@ -574,6 +613,29 @@ class AppInteractions:
             logger.warning(f"Error waiting for scanning: {str(e)}")
             return True  # Continue even if there's an error
     
+    def _scanning_finished(self):
+        """
+        Check whether the result screen appeared or the scanning text is gone
+        
+        Asks the device for matching elements only, instead of transferring
+        the whole page source each poll. The implicit wait is turned off for
+        these probes, so an empty result returns at once instead of blocking
+        for IMPLICIT_WAIT seconds.
+        """
+        driver = self.driver.driver
+        driver.implicitly_wait(0)
+        try:
+            if driver.find_elements(AppiumBy.XPATH, RESULT_SCREEN_XPATH):
+                return True
+            return not driver.find_elements(AppiumBy.XPATH, STILL_SCANNING_XPATH)
+        except InvalidSelectorException:
+            page_source = self.driver.get_page_source()
+            if not page_source:
+                return False
+            return bool(RESULT_SCREEN_PATTERN.search(page_source)) or not STILL_SCANNING_PATTERN.search(page_source)
+        finally:
+            driver.implicitly_wait(IMPLICIT_WAIT)
+    
     def handle_advertisement(self):
         """Handle advertisement: wait 5 seconds and click Close button"""
         try:
@@ -42,6 +42,10 @@ AUGMENTED_IMAGES_DIR = "../dragonfly_augmentation/samples/augmented"
 TEST_RESULTS_DIR = "test_results"
 TEST_REPORTS_DIR = "reports"
 
+# Screenshots kept in memory per device; written to TEST_RESULTS_DIR only for
+# failed/errored tests
+MAX_SCREENSHOTS = 10
+
 # Test Data File
 TEST_CASES_CSV = f"{TEST_DATA_DIR}/dragonfly_test_cases.csv"
 
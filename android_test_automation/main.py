@@ -51,6 +51,21 @@ def main():
         action="store_true",
         help="List available test images"
     )
+    parser.add_argument(
+        "--udid",
+        action="append",
+        help="Device UDID to test on; repeat to run tests in parallel across several devices"
+    )
+    parser.add_argument(
+        "--legacy-upload",
+        action="store_true",
+        help="Upload images by navigating the gallery picker instead of sending them via Intent"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run test cases that already passed with unchanged images in a previous run"
+    )
     parser.add_argument(
         "--manual-mode",
         action="store_true",
@@ -87,7 +102,8 @@ def main():
         
         # Initialize test runner
         logger.info("Initializing test runner...")
-        runner = TestRunner(use_augmentation=args.use_augmentation, manual_mode=args.manual_mode)
+        runner = TestRunner(use_augmentation=args.use_augmentation, manual_mode=args.manual_mode,
+                            udids=args.udid, legacy_upload=args.legacy_upload)
         
         # Setup
         if not runner.setup(skip_onboarding=args.manual_mode):
@@ -111,7 +127,8 @@ def main():
             
             # Run tests
             logger.info(f"Running {len(test_cases)} test case(s)...")
-            results = runner.run_all_tests(test_cases)
+            # An explicitly requested test always runs
+            results = runner.run_all_tests(test_cases, force=args.force or bool(args.test_id))
             
             # Generate report (even if interrupted)
             if results:
@@ -7,7 +7,7 @@ import csv
 import os
 import logging
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Set, Tuple
 
 from config import (
     TEST_DATA_DIR,
@@ -18,6 +18,25 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+# Supported image extensions (matched case-insensitively)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
+
+# Fallback locations searched when an image is missing from its primary directory
+ALTERNATIVE_IMAGE_DIRS = [
+    Path("samples/original"),
+    Path("samples/augmented"),
+    Path("../dragonfly_augmentation/samples/original"),
+    Path("../dragonfly_augmentation/samples/augmented"),
+]
+
+# Default test cases for dragonfly images
+DEFAULT_TEST_CASES_CSV = (
+    "test_id,image_name,expected_species,image_type,augmentation\n"
+    "TC001,dragonfly_closeup_1.jpg,dragonfly,original,none\n"
+    "TC002,dragonfly_in_flight_3.jpg,dragonfly,original,none\n"
+    "TC003,dragonfly_perched_on_leaf_2.jpg,dragonfly,original,none\n"
+)
+
 
 class TestDataManager:
     """Manages test data and test cases"""
@@ -28,42 +47,26 @@ class TestDataManager:
         self.test_cases_file = Path(TEST_CASES_CSV)
         self.original_images_dir = Path(ORIGINAL_IMAGES_DIR)
         self.augmented_images_dir = Path(AUGMENTED_IMAGES_DIR)
+        self._index: Dict[Path, Set[str]] = {}
+        self._path_cache: Dict[Tuple[str, str], Path] = {}
     
-    def create_default_test_cases(self):
-        """Create default test cases CSV if it doesn't exist"""
+    def create_default_test_cases(self) -> Optional[List[Dict]]:
+        """
+        Create default test cases CSV if it doesn't exist
+        
+        Returns:
+            The default test cases that were written, or None if the file
+            already existed
+        """
         if self.test_cases_file.exists():
             logger.info(f"Test cases file already exists: {self.test_cases_file}")
-            return
+            return None
         
         logger.info("Creating default test cases file...")
         
-        # Default test cases for dragonfly images
-        default_cases = [
-            {
-                "test_id": "TC001",
-                "image_name": "dragonfly_closeup_1.jpg",
-                "expected_species": "dragonfly",
-                "image_type": "original",
-                "augmentation": "none",
-            },
-            {
-                "test_id": "TC002",
-                "image_name": "dragonfly_in_flight_3.jpg",
-                "expected_species": "dragonfly",
-                "image_type": "original",
-                "augmentation": "none",
-            },
-            {
-                "test_id": "TC003",
-                "image_name": "dragonfly_perched_on_leaf_2.jpg",
-                "expected_species": "dragonfly",
-                "image_type": "original",
-                "augmentation": "none",
-            },
-        ]
-        
-        self.save_test_cases(default_cases)
+        self.test_cases_file.write_text(DEFAULT_TEST_CASES_CSV)
         logger.info(f"Created default test cases file: {self.test_cases_file}")
+        return list(csv.DictReader(DEFAULT_TEST_CASES_CSV.splitlines()))
     
     def save_test_cases(self, test_cases: List[Dict]):
         """Save test cases to CSV file"""
@@ -88,7 +91,11 @@ class TestDataManager:
         try:
             if not self.test_cases_file.exists():
                 logger.warning("Test cases file not found, creating default...")
-                self.create_default_test_cases()
+                default_cases = self.create_default_test_cases()
+                if default_cases is not None:
+                    # Already known in-process; skip reading the file back
+                    logger.info(f"Loaded {len(default_cases)} default test cases")
+                    return default_cases
             
             test_cases = []
             with open(self.test_cases_file, 'r') as f:
@@ -107,6 +114,11 @@ class TestDataManager:
         """
         Get full path to test image
         
+        Lookups go through a lazily built index of directory listings, so a
+        miss costs no filesystem calls once each directory has been scanned,
+        and resolved paths are memoized per (image_name, image_type).
+        Call invalidate_index() after writing new images.
+        
         Args:
             image_name: Name of the image file
             image_type: 'original' or 'augmented'
@@ -114,28 +126,47 @@ class TestDataManager:
         Returns:
             Path object to the image file
         """
-        if image_type == "original":
-            image_path = self.original_images_dir / image_name
-        else:
-            image_path = self.augmented_images_dir / image_name
-        
-        if not image_path.exists():
-            logger.warning(f"Image not found: {image_path}")
-            # Try alternative locations
-            alt_paths = [
-                Path("samples/original") / image_name,
-                Path("samples/augmented") / image_name,
-                Path("../dragonfly_augmentation/samples/original") / image_name,
-                Path("../dragonfly_augmentation/samples/augmented") / image_name,
-            ]
-            
-            for alt_path in alt_paths:
-                if alt_path.exists():
-                    logger.info(f"Found image at alternative location: {alt_path}")
-                    return alt_path
+        key = (image_name, image_type)
+        image_path = self._path_cache.get(key)
+        if image_path is None:
+            image_path = self._path_cache[key] = self._resolve_image_path(image_name, image_type)
+        return image_path
+    
+    def _resolve_image_path(self, image_name: str, image_type: str) -> Path:
+        """Find an image in its primary directory or an alternative location"""
+        image_dir = self._image_dir(image_type)
+        image_path = image_dir / image_name
+        
+        if image_name in self.known_files(image_dir):
+            return image_path
+        
+        logger.warning(f"Image not found: {image_path}")
+        # Try alternative locations
+        for alt_dir in ALTERNATIVE_IMAGE_DIRS:
+            if image_name in self.known_files(alt_dir):
+                alt_path = alt_dir / image_name
+                logger.info(f"Found image at alternative location: {alt_path}")
+                return alt_path
         
         return image_path
     
+    def known_files(self, directory: Path) -> Set[str]:
+        """Return the cached set of file names in a directory, scanning it once"""
+        names = self._index.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            self._index[directory] = names
+        return names
+    
+    def invalidate_index(self):
+        """Drop cached directory listings (call after images are added or removed)"""
+        self._index.clear()
+        self._path_cache.clear()
+    
     def add_augmented_test_cases(self, original_image: str, augmentation_effects: List[str]):
         """
         Add test cases for augmented images
@@ -157,9 +188,10 @@ class TestDataManager:
             base_test_id = f"TC{len(existing_cases) + 1:03d}"
         
         # Add augmented test cases
+        stem = os.path.splitext(os.path.basename(original_image))[0]
         new_cases = []
         for i, effect in enumerate(augmentation_effects):
-            augmented_name = f"{Path(original_image).stem}_{effect}.png"
+            augmented_name = f"{stem}_{effect}.png"
             test_id = f"{base_test_id}_AUG{i+1:02d}"
             
             new_cases.append({
@@ -176,27 +208,36 @@ class TestDataManager:
         
         logger.info(f"Added {len(new_cases)} augmented test cases")
     
-    def list_available_images(self, image_type: str = "original") -> List[str]:
-        """List all available test images"""
+    def _image_dir(self, image_type: str) -> Path:
+        """Resolve the directory holding images of the given type"""
         if image_type == "original":
-            image_dir = self.original_images_dir
-        else:
-            image_dir = self.augmented_images_dir
+            return self.original_images_dir
+        return self.augmented_images_dir
+    
+    def iter_available_images(self, image_type: str = "original") -> Iterator[str]:
+        """
+        Yield full paths of available test images
         
-        if not image_dir.exists():
-            logger.warning(f"Image directory not found: {image_dir}")
-            return []
+        Paths come straight from os.DirEntry.path so callers that only need
+        a path string don't pay for Path construction per file.
         
-        # Supported image extensions
-        extensions = ['.jpg', '.jpeg', '.png', '.webp']
+        Args:
+            image_type: 'original' or 'augmented'
+            
+        Yields:
+            Path string for each image file
+        """
+        image_dir = self._image_dir(image_type)
         
-        images = []
-        for ext in extensions:
-            images.extend(list(image_dir.glob(f"*{ext}")))
-            images.extend(list(image_dir.glob(f"*{ext.upper()}")))
+        if not image_dir.exists():
+            logger.warning(f"Image directory not found: {image_dir}")
+            return
         
-        return [img.name for img in images]
-
-
-
-
+        with os.scandir(image_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                    yield entry.path
+    
+    def list_available_images(self, image_type: str = "original") -> List[str]:
+        """List all available test images"""
+        return [os.path.basename(path) for path in self.iter_available_images(image_type)]
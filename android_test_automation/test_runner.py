@@ -3,18 +3,44 @@ Main Test Runner for Android App Automation
 Integrates augmentation framework with app testing
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
+import os
+import re
+import threading
 import time
 import json
-from datetime import datetime
+from collections import deque
+from dataclasses import asdict, dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import InvalidSelectorException, TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
 
 from app_driver import AppDriver
-from app_interactions import AppInteractions
+from app_interactions import (
+    AppInteractions,
+    RESULT_SCREEN_TEXT,
+    SCANNING_STARTED_TEXT,
+    contains_any_xpath,
+    keyword_alternation,
+)
 from result_classifier import ResultClassifier
 from test_data_manager import TestDataManager
-from config import TEST_RESULTS_DIR, TEST_REPORTS_DIR
+from config import (
+    TEST_RESULTS_DIR,
+    TEST_REPORTS_DIR,
+    DEVICE_CONFIG,
+    MAX_SCREENSHOTS,
+    APP_PACKAGE,
+    APP_ACTIVITY,
+)
 
 # Import augmentation framework
 import sys
@@ -27,50 +53,115 @@ except ImportError:
     WeatherAugmentor = None
     logger.warning("Could not import WeatherAugmentor. Augmentation features disabled.")
 
+# orjson is optional; it serializes large reports much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Both indicator groups compiled once into a single pattern, so one left-to-right
+# pass finds the first indicator of either kind; match.lastgroup says which
+INDICATOR_PATTERN = re.compile(
+    "(?P<scanning>" + keyword_alternation(SCANNING_STARTED_TEXT) + ")"
+    "|(?P<result>" + keyword_alternation(RESULT_SCREEN_TEXT) + ")"
+)
+
+# Matches any element whose text or content-desc contains an indicator
+INDICATOR_XPATH = contains_any_xpath(SCANNING_STARTED_TEXT + RESULT_SCREEN_TEXT)
+
+
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
+class TestResult:
+    """Outcome of one test case (slotted where supported to keep large runs small)"""
+    test_id: str
+    image_name: str
+    image_type: str
+    augmentation: str
+    expected_species: str
+    timestamp_ms: int  # Offset from run start
+    status: str = "failed"
+    app_result: Optional[Dict] = None
+    classification: Optional[Dict] = None
+    error: Optional[str] = None
+    timestamp: Optional[str] = None  # ISO time, filled in by generate_report
+
 
 class TestRunner:
     """Main test runner that orchestrates the entire testing process"""
     
-    def __init__(self, use_augmentation: bool = True, manual_mode: bool = False):
+    def __init__(self, use_augmentation: bool = True, manual_mode: bool = False,
+                 udids: Optional[List[str]] = None, legacy_upload: bool = False):
         """
         Initialize test runner
         
         Args:
             use_augmentation: Whether to use augmented images for testing
             manual_mode: If True, user handles onboarding and image selection manually
+            udids: Devices to run on (defaults to DEVICE_CONFIG["udid"]). With more
+                than one device, automated runs execute tests concurrently.
+            legacy_upload: If True, upload images by navigating the gallery picker
+                (falling back to an Intent) instead of always using an Intent
         """
-        self.driver = AppDriver()
+        self.drivers = [AppDriver(udid) for udid in (udids or [DEVICE_CONFIG["udid"]])]
+        self.interactions = []
+        # Primary device, used by manual mode and single-device runs
+        self.driver = self.drivers[0]
         self.app_interactions = None
         self.classifier = ResultClassifier()
         self.data_manager = TestDataManager()
         self.use_augmentation = use_augmentation
         self.manual_mode = manual_mode
+        self.legacy_upload = legacy_upload
         self.augmentor = WeatherAugmentor(intensity="medium") if (use_augmentation and WeatherAugmentor) else None
         
         # Create results directories
-        Path(TEST_RESULTS_DIR).mkdir(exist_ok=True)
-        Path(TEST_REPORTS_DIR).mkdir(exist_ok=True)
+        self._results_dir = Path(TEST_RESULTS_DIR)
+        self._reports_dir = Path(TEST_REPORTS_DIR)
+        self._results_dir.mkdir(exist_ok=True)
+        self._reports_dir.mkdir(exist_ok=True)
         
         self.test_results = []
+        # Wall-clock run start plus a monotonic reference for per-test offsets
+        self._run_start = datetime.now()
+        self._run_start_mono = time.monotonic()
+        self._seen_test_ids = set()  # test_ids already in self.test_results
+        # Last known (image sha, status, classification) per test_id, used to skip
+        # passed tests on re-runs while still counting them in the report
+        self._manifest_file = self._reports_dir / "manifest.json"
+        self._manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._image_digests = {}
+        # Copies the next test's image to its device while the current test runs
+        self._push_pool = ThreadPoolExecutor(max_workers=len(self.drivers))
+        # Recent (test_id, stage, png_bytes) frames per device, flushed on failure
+        self._screenshot_rings = {
+            driver.udid: deque(maxlen=MAX_SCREENSHOTS) for driver in self.drivers
+        }
     
     def setup(self, skip_onboarding: bool = False):
         """Setup test environment"""
         try:
             logger.info("Setting up test environment...")
             
-            # Start Appium driver
-            self.driver.start_driver()
+            # Start one Appium session per device
+            for driver in self.drivers:
+                driver.start_driver()
             
             # Initialize app interactions
-            self.app_interactions = AppInteractions(self.driver)
+            self.interactions = [AppInteractions(driver) for driver in self.drivers]
+            self.app_interactions = self.interactions[0]
             
             if not skip_onboarding:
                 # Handle permissions and onboarding - ULTRA FAST
                 time.sleep(0.5)  # Minimal wait for app to load
-                self.app_interactions.skip_onboarding()
-                self.app_interactions.handle_permissions()  # Fast check only
+                for interactions in self.interactions:
+                    if self._onboarding_already_done(interactions.driver):
+                        logger.info(f"Onboarding already completed on {interactions.driver.udid} - skipping")
+                    elif interactions.skip_onboarding():
+                        self._save_app_profile(interactions.driver, {"onboarding_done": True})
+                    interactions.handle_permissions()  # Fast check only
             else:
                 # Manual mode: Just launch app and handle permissions
                 logger.info("=" * 60)
@@ -97,26 +188,66 @@ class TestRunner:
             logger.error(f"Error during setup: {str(e)}")
             return False
     
+    def _app_profile_path(self, driver: AppDriver) -> Path:
+        """Profile file for a device/app pair, kept across runs"""
+        key = hashlib.blake2s(f"{driver.udid}:{APP_PACKAGE}:{APP_ACTIVITY}".encode()).hexdigest()
+        return self._results_dir / "app_state_profiles" / f"{key}.json"
+    
+    def _save_app_profile(self, driver: AppDriver, profile: Dict):
+        """Persist what was learned about the app state on a device"""
+        profile_file = self._app_profile_path(driver)
+        try:
+            profile_file.parent.mkdir(exist_ok=True)
+            profile_file.write_text(json.dumps(profile))
+        except OSError as e:
+            logger.warning(f"Could not save app state profile: {str(e)}")
+    
+    def _onboarding_already_done(self, driver: AppDriver) -> bool:
+        """
+        Check whether onboarding can be skipped on a warm run
+        
+        Only trusted when app data survives between sessions (noReset), and
+        confirmed with a single quick element check instead of the full
+        onboarding sequence.
+        """
+        if not DEVICE_CONFIG.get("noReset"):
+            return False
+        try:
+            profile = json.loads(self._app_profile_path(driver).read_text())
+        except (OSError, ValueError):
+            return False
+        if not profile.get("onboarding_done"):
+            return False
+        return not driver.element_exists("//*[@content-desc='Get Started']", timeout=0.5)
+    
     def teardown(self):
         """Cleanup after tests"""
         try:
             logger.info("Tearing down test environment...")
-            if self.driver:
-                self.driver.stop_driver()
+            self._push_pool.shutdown(wait=True)
+            for driver in self.drivers:
+                driver.stop_driver()
             logger.info("Test environment torn down")
         except Exception as e:
             logger.error(f"Error during teardown: {str(e)}")
     
-    def run_single_test(self, test_case: Dict) -> Dict:
+    def run_single_test(self, test_case: Dict, driver: Optional[AppDriver] = None,
+                        app_interactions: Optional[AppInteractions] = None) -> TestResult:
         """
         Run a single test case
         
         Args:
             test_case: Dict with test case information
+            driver: Device session to use (defaults to the primary device)
+            app_interactions: Interactions bound to ``driver``
             
         Returns:
-            Dict with test result
+            TestResult for the test case
         """
+        driver = driver or self.driver
+        app_interactions = app_interactions or self.app_interactions
+        screenshot_ring = self._screenshot_rings[driver.udid]
+        
         test_id = test_case.get("test_id", "UNKNOWN")
         image_name = test_case.get("image_name", "")
         expected_species = test_case.get("expected_species", "dragonfly")
@@ -125,159 +256,278 @@ class TestRunner:
         
         logger.info(f"Running test case: {test_id} - {image_name}")
         
-        result = {
-            "test_id": test_id,
-            "image_name": image_name,
-            "image_type": image_type,
-            "augmentation": augmentation,
-            "expected_species": expected_species,
-            "timestamp": datetime.now().isoformat(),
-            "status": "failed",
-            "app_result": None,
-            "classification": None,
-            "error": None,
-        }
+        result = TestResult(
+            test_id=test_id,
+            image_name=image_name,
+            image_type=image_type,
+            augmentation=augmentation,
+            expected_species=expected_species,
+            timestamp_ms=int((time.monotonic() - self._run_start_mono) * 1000),
+        )
+        
+        # Check the image before touching the device, so a known-bad test case
+        # costs no screenshot or Appium round-trips
+        image_path = self.data_manager.get_image_path(image_name, image_type)
+        if image_path.name not in self.data_manager.known_files(image_path.parent):
+            logger.error(f"Error in test {test_id}: Image not found: {image_path}")
+            result.error = f"Image not found: {image_path}"
+            result.status = "error"
+            if test_id not in self._seen_test_ids:
+                self._seen_test_ids.add(test_id)
+                self.test_results.append(result)
+            self._record_in_manifest(test_case, result)
+            return result
         
         try:
-            # Get image path
-            image_path = self.data_manager.get_image_path(image_name, image_type)
-            
-            if not image_path.exists():
-                raise FileNotFoundError(f"Image not found: {image_path}")
-            
             # Take screenshot before test
-            screenshot_before = f"{TEST_RESULTS_DIR}/screenshot_before_{test_id}.png"
-            self.driver.take_screenshot(screenshot_before)
+            screenshot_ring.append((test_id, "before", driver.get_screenshot_png()))
             
             if self.manual_mode:
                 # Manual mode: Wait for user to select image, then process
-                print("\n" + "=" * 60)
-                print("📸 PROCESSING TEST IMAGE...")
-                print("=" * 60)
-                print(f"Test Case: {test_id}")
-                print(f"Expected Species: {expected_species}")
-                print(f"Image: {image_name}")
-                print("=" * 60)
-                print("Taking image as input...")
-                print("Automation will detect when image is processed and extract results.")
-                print("=" * 60 + "\n")
+                print("\n".join([
+                    "",
+                    "=" * 60,
+                    "📸 PROCESSING TEST IMAGE...",
+                    "=" * 60,
+                    f"Test Case: {test_id}",
+                    f"Expected Species: {expected_species}",
+                    f"Image: {image_name}",
+                    "=" * 60,
+                    "Taking image as input...",
+                    "Automation will detect when image is processed and extract results.",
+                    "=" * 60,
+                    "",
+                ]))
                 
                 # Wait for user to select image - detect when scanning starts or result appears
                 self._wait_for_image_selection()
                 
                 # Wait for scanning/progress to complete
-                self.app_interactions.wait_for_scanning()
+                app_interactions.wait_for_scanning()
             else:
                 # Automated mode: Upload image to app
                 logger.info(f"Uploading image: {image_path}")
                 
-                # Try gallery method first
-                if self.app_interactions.open_gallery():
-                    if self.app_interactions.select_image_from_gallery(str(image_path)):
+                if not self.legacy_upload:
+                    # Push + Intent in one shot, no gallery UI navigation
+                    app_interactions.upload_image_via_intent(str(image_path))
+                # Legacy: try gallery method first
+                elif app_interactions.open_gallery():
+                    if app_interactions.select_image_from_gallery(str(image_path)):
                         logger.info("Image uploaded via gallery")
                     else:
                         # Fallback to Intent method
                         logger.info("Trying Intent method...")
-                        self.app_interactions.upload_image_via_intent(str(image_path))
+                        app_interactions.upload_image_via_intent(str(image_path))
                 else:
                     # Use Intent method directly
-                    self.app_interactions.upload_image_via_intent(str(image_path))
+                    app_interactions.upload_image_via_intent(str(image_path))
                 
                 # Wait for scanning/progress to complete
-                self.app_interactions.wait_for_scanning()
+                app_interactions.wait_for_scanning()
             
             # Handle advertisement if present
-            self.app_interactions.handle_advertisement()
+            app_interactions.handle_advertisement()
             
             # Extract result
-            print("\n" + "=" * 60)
-            print("📊 EXTRACTING RESULT...")
-            print("=" * 60)
-            app_result = self.app_interactions.extract_result()
-            result["app_result"] = app_result
+            print("\n" + "=" * 60 + "\n📊 EXTRACTING RESULT...\n" + "=" * 60)
+            app_result = app_interactions.extract_result()
+            result.app_result = app_result
             
             # Classify result
             classification = self.classifier.classify_result(app_result, expected_species)
-            result["classification"] = classification
-            result["status"] = "passed" if classification["category"] == "correct_species" else "failed"
+            result.classification = classification
+            result.status = "passed" if classification["category"] == "correct_species" else "failed"
             
             # Take screenshot after test
-            screenshot_after = f"{TEST_RESULTS_DIR}/screenshot_after_{test_id}.png"
-            self.driver.take_screenshot(screenshot_after)
+            screenshot_ring.append((test_id, "after", driver.get_screenshot_png()))
             
-            # Print result to terminal
-            print("\n" + "=" * 60)
-            print("✅ TEST RESULT")
-            print("=" * 60)
-            print(f"Test ID: {test_id}")
-            print(f"Image: {image_name}")
-            print(f"Expected Species: {expected_species}")
-            print("-" * 60)
+            # Print result to terminal (one write per test)
             app_species = app_result.get('species', 'Not found')
             if app_species is None:
                 app_species = "No Insect Visible"
-            print(f"App Result: {app_species}")
             full_text_preview = app_result.get('full_text', 'N/A')
             if len(full_text_preview) > 100:
                 full_text_preview = full_text_preview[:100] + "..."
-            print(f"Full Text: {full_text_preview}")
-            print("-" * 60)
-            print(f"Classification: {classification['category']}")
-            print(f"Output: {classification['app_species']}")
-            print(f"Reason: {classification['reason']}")
-            print("=" * 60 + "\n")
+            print("\n".join([
+                "",
+                "=" * 60,
+                "✅ TEST RESULT",
+                "=" * 60,
+                f"Test ID: {test_id}",
+                f"Image: {image_name}",
+                f"Expected Species: {expected_species}",
+                "-" * 60,
+                f"App Result: {app_species}",
+                f"Full Text: {full_text_preview}",
+                "-" * 60,
+                f"Classification: {classification['category']}",
+                f"Output: {classification['app_species']}",
+                f"Reason: {classification['reason']}",
+                "=" * 60,
+                "",
+            ]))
             
             logger.info(f"Test {test_id} completed: {classification['category']}")
             
             # Save result immediately to self.test_results (so it's available even if interrupted)
             # This ensures the result is saved even if Ctrl+C is pressed right after
-            if result not in self.test_results:
+            if test_id not in self._seen_test_ids:
+                self._seen_test_ids.add(test_id)
                 self.test_results.append(result)
             
             # In manual mode, click Identify button for next test (but don't wait for next image yet)
             if self.manual_mode:
-                print("\n" + "=" * 60)
-                print("🔄 PREPARING FOR NEXT TEST...")
-                print("=" * 60)
-                print("Selecting next test image...")
-                print("=" * 60 + "\n")
+                print("\n".join([
+                    "",
+                    "=" * 60,
+                    "🔄 PREPARING FOR NEXT TEST...",
+                    "=" * 60,
+                    "Selecting next test image...",
+                    "=" * 60,
+                    "",
+                ]))
                 
-                if self.app_interactions.click_identify_button():
+                if app_interactions.click_identify_button():
                     time.sleep(2)  # Wait for screen to change
                     logger.info("✓ Identify button clicked - ready for next test")
                 else:
                     logger.warning("Could not click Identify button - you may need to click it manually")
             else:
                 # Reset for next test (automated mode)
-                self.app_interactions.reset_for_next_test()
+                app_interactions.reset_for_next_test()
                 time.sleep(2)
             
         except KeyboardInterrupt:
             # If interrupted during test, save what we have
             logger.info(f"Test {test_id} interrupted by user")
-            result["status"] = "interrupted"
-            result["error"] = "Test interrupted by user"
+            result.status = "interrupted"
+            result.error = "Test interrupted by user"
             # Save partial result
-            if result not in self.test_results:
+            if test_id not in self._seen_test_ids:
+                self._seen_test_ids.add(test_id)
                 self.test_results.append(result)
             raise  # Re-raise to be caught by outer handler
             
         except Exception as e:
             logger.error(f"Error in test {test_id}: {str(e)}")
-            result["error"] = str(e)
-            result["status"] = "error"
+            result.error = str(e)
+            result.status = "error"
             # Save error result
-            if result not in self.test_results:
+            if test_id not in self._seen_test_ids:
+                self._seen_test_ids.add(test_id)
                 self.test_results.append(result)
         
+        if result.status in ("error", "failed"):
+            self._flush_screenshots(screenshot_ring)
+        self._record_in_manifest(test_case, result)
+        
         return result
     
-    def run_all_tests(self, test_cases: Optional[List[Dict]] = None) -> List[Dict]:
+    def _image_digest(self, test_case: Dict) -> Optional[str]:
+        """SHA-256 of a test case's image file, computed once per path"""
+        image_path = self.data_manager.get_image_path(
+            test_case.get("image_name", ""), test_case.get("image_type", "original")
+        )
+        digest = self._image_digests.get(image_path)
+        if digest is None:
+            try:
+                sha = hashlib.sha256()
+                with open(image_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        sha.update(chunk)
+            except OSError:
+                return None
+            digest = self._image_digests[image_path] = sha.hexdigest()
+        return digest
+    
+    def _load_manifest(self) -> Dict:
+        """Load the results manifest from the previous run, if any"""
+        try:
+            return json.loads(self._manifest_file.read_text())
+        except (OSError, ValueError):
+            return {}
+    
+    def _record_in_manifest(self, test_case: Dict, result: TestResult):
+        """Record a test's outcome in the manifest, replacing the file atomically"""
+        entry = {
+            "sha": self._image_digest(test_case),
+            "status": result.status,
+            "classification": result.classification,
+        }
+        with self._manifest_lock:
+            self._manifest[result.test_id] = entry
+            tmp_file = self._manifest_file.with_suffix(".json.tmp")
+            try:
+                tmp_file.write_text(json.dumps(self._manifest, indent=2))
+                os.replace(tmp_file, self._manifest_file)
+            except OSError as e:
+                logger.warning(f"Could not update results manifest: {str(e)}")
+    
+    def _skip_passed(self, test_cases: List[Dict]) -> Tuple[List[Dict], List[TestResult]]:
+        """
+        Split off test cases that passed last time with an unchanged image
+        
+        Skipped cases are not run again but come back as "skipped" results
+        carrying their previous classification, so reports still count them.
+        
+        Returns:
+            Tuple of (test cases to run, results for the skipped cases)
+        """
+        remaining = []
+        skipped = []
+        for test_case in test_cases:
+            test_id = test_case.get("test_id")
+            expected_species = test_case.get("expected_species", "dragonfly")
+            previous = self._manifest.get(test_id)
+            digest = self._image_digest(test_case)
+            # Only reuse a pass for the same, existing image and the same expectation
+            if (previous and previous.get("status") == "passed"
+                    and previous.get("classification")
+                    and previous["classification"].get("expected_species") == expected_species
+                    and digest is not None
+                    and previous.get("sha") == digest):
+                result = TestResult(
+                    test_id=test_id,
+                    image_name=test_case.get("image_name", ""),
+                    image_type=test_case.get("image_type", "original"),
+                    augmentation=test_case.get("augmentation", "none"),
+                    expected_species=expected_species,
+                    timestamp_ms=0,
+                    status="skipped",
+                    classification=previous["classification"],
+                )
+                skipped.append(result)
+                if test_id not in self._seen_test_ids:
+                    self._seen_test_ids.add(test_id)
+                    self.test_results.append(result)
+                continue
+            remaining.append(test_case)
+        
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} test case(s) that already passed with unchanged images (use --force to re-run)")
+        return remaining, skipped
+    
+    def _flush_screenshots(self, screenshot_ring: deque):
+        """Write buffered screenshots to TEST_RESULTS_DIR and empty the buffer"""
+        while screenshot_ring:
+            test_id, stage, png = screenshot_ring.popleft()
+            if png is None:
+                continue
+            screenshot_file = self._results_dir / f"screenshot_{stage}_{test_id}.png"
+            try:
+                screenshot_file.write_bytes(png)
+                logger.info(f"Screenshot saved: {screenshot_file}")
+            except OSError as e:
+                logger.error(f"Failed to save screenshot {screenshot_file}: {str(e)}")
+    
+    def run_all_tests(self, test_cases: Optional[List[Dict]] = None, force: bool = False) -> List[TestResult]:
         """
         Run all test cases
         
         Args:
             test_cases: Optional list of test cases (loads from file if not provided)
+            force: Re-run tests that already passed with the same image last time
             
         Returns:
             List of test results
@@ -289,27 +539,60 @@ class TestRunner:
             logger.error("No test cases found!")
             return []
         
+        # In manual mode the image is picked on the device, so the test case's
+        # image digest says nothing about what was tested - always run
+        skipped = []
+        if not force and not self.manual_mode:
+            test_cases, skipped = self._skip_passed(test_cases)
+            if not test_cases:
+                logger.info("All test cases already passed - nothing to run")
+                return skipped
+        
         logger.info(f"Running {len(test_cases)} test cases...")
         print("\n" + "=" * 60)
         print("ℹ️  TIP: Press Ctrl+C at any time to stop and see summary")
         print("=" * 60 + "\n")
         
+        if len(self.drivers) > 1 and not self.manual_mode:
+            # Several devices: run tests concurrently, one event loop for all devices
+            try:
+                return skipped + asyncio.run(self.run_all_tests_async(test_cases))
+            except KeyboardInterrupt:
+                logger.info(f"Test execution interrupted. Completed {len(self.test_results)}/{len(test_cases)} tests")
+                return self.test_results
+        
         results = []
+        pending_push = None
         try:
             for i, test_case in enumerate(test_cases, 1):
                 logger.info(f"\n{'='*60}")
                 logger.info(f"Test {i}/{len(test_cases)}: {test_case.get('test_id')}")
                 logger.info(f"{'='*60}")
                 
+                # Images are only uploaded by automation outside manual mode: make sure
+                # this test's image is on the device, then start copying the next one
+                if not self.manual_mode:
+                    if i == 1:
+                        pending_push = self._prefetch_image(test_case, self.app_interactions)
+                    self._finish_prefetch(pending_push)
+                    pending_push = (
+                        self._prefetch_image(test_cases[i], self.app_interactions)
+                        if i < len(test_cases) else None
+                    )
+                
                 # In manual mode, for first test, user needs to select image
                 # For subsequent tests, we click Identify button after previous test
                 # So we wait for image selection before processing
                 if self.manual_mode and i == 1:
-                    print("\n" + "=" * 60)
-                    print("📸 STARTING TEST AUTOMATION")
-                    print("=" * 60)
-                    print("Initializing app and preparing for image processing...")
-                    print("=" * 60 + "\n")
+                    print("\n".join([
+                        "",
+                        "=" * 60,
+                        "📸 STARTING TEST AUTOMATION",
+                        "=" * 60,
+                        "Initializing app and preparing for image processing...",
+                        "=" * 60,
+                        "",
+                    ]))
                 
                 result = self.run_single_test(test_case)
                 # Add to results list (result is already saved to self.test_results in run_single_test)
@@ -334,9 +617,108 @@ class TestRunner:
             # Return all completed results
             return self.test_results
         
+        return skipped + results
+    
+    async def run_single_test_async(self, test_case: Dict, device_index: int = 0) -> TestResult:
+        """
+        Run a single test case without blocking the event loop
+        
+        The Appium client is synchronous, so the test runs in a worker thread
+        while other devices' tests proceed on the same loop.
+        
+        Args:
+            test_case: Dict with test case information
+            device_index: Index of the device session to run on
+            
+        Returns:
+            TestResult for the test case
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(
+            self.run_single_test, test_case,
+            self.drivers[device_index], self.interactions[device_index],
+        ))
+    
+    def _prefetch_image(self, test_case: Dict, app_interactions: AppInteractions) -> Optional[Future]:
+        """Start copying a test case's image to the device in the background"""
+        image_path = self.data_manager.get_image_path(
+            test_case.get("image_name", ""), test_case.get("image_type", "original")
+        )
+        if image_path.name not in self.data_manager.known_files(image_path.parent):
+            return None  # run_single_test reports the missing image
+        return self._push_pool.submit(app_interactions.push_image, str(image_path))
+    
+    def _finish_prefetch(self, future: Optional[Future]):
+        """Wait for a background image copy; on failure the upload step copies it again"""
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception as e:
+            logger.warning(f"Could not pre-copy image to device: {str(e)}")
+    
+    async def _worker(self, queue: asyncio.Queue, device_index: int, results: List[TestResult]):
+        """
+        Pull test cases off the queue and run them on one device until a
+        None sentinel arrives
+        
+        The worker takes the next test case before running the current one so
+        its image can be copied to the device in the background meanwhile.
+        """
+        interactions = self.interactions[device_index]
+        loop = asyncio.get_running_loop()
+        test_case = await queue.get()
+        pending_push = self._prefetch_image(test_case, interactions) if test_case else None
+        while test_case is not None:
+            logger.info(f"[{self.drivers[device_index].udid}] Test: {test_case.get('test_id')}")
+            await loop.run_in_executor(None, self._finish_prefetch, pending_push)
+            next_case = await queue.get()
+            pending_push = self._prefetch_image(next_case, interactions) if next_case else None
+            results.append(await self.run_single_test_async(test_case, device_index))
+            # Brief pause between tests (automated mode)
+            await asyncio.sleep(2)
+            test_case = next_case
+    
+    async def run_all_tests_async(self, test_cases: List[Dict]) -> List[TestResult]:
+        """
+        Run test cases concurrently across all devices
+        
+        A producer feeds test cases into a bounded queue and one worker per
+        device pulls from it, so a device that finishes early picks up more
+        tests instead of idling on a fixed share.
+        
+        Args:
+            test_cases: List of test cases
+            
+        Returns:
+            List of test results in test case order
+        """
+        device_count = len(self.drivers)
+        queue = asyncio.Queue(maxsize=2 * device_count)
+        results = []
+        
+        async def produce():
+            for test_case in test_cases:
+                await queue.put(test_case)
+            for _ in range(device_count):
+                await queue.put(None)  # One stop sentinel per worker
+        
+        producer = asyncio.create_task(produce())
+        workers = [
+            asyncio.create_task(self._worker(queue, i, results))
+            for i in range(device_count)
+        ]
+        
+        for driver, outcome in zip(self.drivers, await asyncio.gather(*workers, return_exceptions=True)):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Device {driver.udid} stopped running tests: {str(outcome)}")
+        producer.cancel()
+        
+        order = {tc.get("test_id"): i for i, tc in enumerate(test_cases)}
+        results.sort(key=lambda r: order.get(r.test_id, len(order)))
         return results
     
-    def generate_report(self, results: Optional[List[Dict]] = None) -> Dict:
+    def generate_report(self, results: Optional[List[TestResult]] = None) -> Dict:
         """
         Generate test report
         
@@ -354,31 +736,58 @@ class TestRunner:
             return {}
         
         # Get classifications (filter out None values)
-        classifications = [r["classification"] for r in results if r.get("classification") is not None]
+        classifications = [r.classification for r in results if r.classification is not None]
         
-        # Get summary
+        # Get summary (skipped tests count with their previous classification)
         summary = self.classifier.get_category_summary(classifications)
-        
-        # Generate report (safely handle None classifications)
+        summary["skipped"] = sum(1 for r in results if r.status == "skipped")
+        
+        # Bucket results in one pass (safely handle None classifications)
+        detailed_summary = {
+            "correct_species": [],
+            "incorrect_species": [],
+            "no_identification": [],
+            "uncertain": [],  # Keep for backward compatibility but empty
+            "errors": [],
+            "skipped": [],  # Passed last run with the same image, not re-run
+        }
+        result_dicts = []
+        for r in results:
+            # Turn the per-test offset into an ISO timestamp only now that it is written out
+            if r.timestamp is None:
+                r.timestamp = (self._run_start + timedelta(milliseconds=r.timestamp_ms)).isoformat()
+            r_dict = asdict(r)
+            result_dicts.append(r_dict)
+            
+            category = r.classification.get("category") if r.classification else None
+            if category in ("no_identification", "uncertain"):
+                # Combine uncertain and no_identification
+                detailed_summary["no_identification"].append(r_dict)
+            elif category in ("correct_species", "incorrect_species"):
+                detailed_summary[category].append(r_dict)
+            if r.status == "error":
+                detailed_summary["errors"].append(r_dict)
+            elif r.status == "skipped":
+                detailed_summary["skipped"].append(r_dict)
+        
+        # Generate report
+        now = datetime.now()
         report = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "total_tests": len(results),
             "summary": summary,
-            "test_results": results,
-            "detailed_summary": {
-                "correct_species": [r for r in results if r.get("classification") and r.get("classification", {}).get("category") == "correct_species"],
-                "incorrect_species": [r for r in results if r.get("classification") and r.get("classification", {}).get("category") == "incorrect_species"],
-                # Combine uncertain and no_identification
-                "no_identification": [r for r in results if r.get("classification") and r.get("classification", {}).get("category") in ["no_identification", "uncertain"]],
-                "uncertain": [],  # Keep for backward compatibility but empty
-                "errors": [r for r in results if r.get("status") == "error"],
-            }
+            "test_results": result_dicts,
+            "detailed_summary": detailed_summary,
         }
         
         # Save report to file
-        report_file = Path(TEST_REPORTS_DIR) / f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        report_file = self._reports_dir / f"test_report_{now:%Y%m%d_%H%M%S}.json"
+        if orjson is not None:
+            with open(report_file, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_file, 'w') as f:
+                json.dump(report, f, indent=2)
         
         logger.info(f"Report saved to: {report_file}")
         
@@ -393,24 +802,33 @@ class TestRunner:
         Detects when image selection is complete by looking for:
         - Scanning screen ("Finalizing profile...")
         - Result screen (has "Dragonfly" or "No Insect Detected")
+        
+        The indicator lookup runs server-side as one XPath query that blocks
+        until a matching element appears, instead of pulling the whole page
+        source every couple of seconds.
         """
         try:
             logger.info("Waiting for image to be processed...")
             print("⏳ Processing image...")
             print("   (Waiting for app to process the image)")
-            start_time = time.time()
-            check_count = 0
+            start_time = time.monotonic()
+            deadline = start_time + max_wait
             consecutive_errors = 0
-            max_consecutive_errors = 5  # If we can't get page source 5 times in a row, proceed
+            max_consecutive_errors = 5  # If the query fails 5 times in a row, proceed
             
-            while time.time() - start_time < max_wait:
-                check_count += 1
-                page_source = None
-                
+            while (now := time.monotonic()) < deadline:
+                # Block for up to 10 seconds per query so progress can be shown
+                window = min(10, deadline - now)
                 try:
-                    page_source = self.driver.get_page_source()
-                    consecutive_errors = 0  # Reset error count on success
-                except Exception as e:
+                    indicator_kind = WebDriverWait(self.driver.driver, window, poll_frequency=0.5).until(
+                        lambda _: self._find_indicator()
+                    )
+                except TimeoutException:
+                    consecutive_errors = 0
+                    elapsed = int(time.monotonic() - start_time)
+                    print(f"   Still waiting... ({elapsed}s elapsed)")
+                    continue
+                except WebDriverException:
                     consecutive_errors += 1
                     # If instrumentation keeps failing, the app might be on result screen already
                     if consecutive_errors >= max_consecutive_errors:
@@ -423,46 +841,13 @@ class TestRunner:
                     time.sleep(3)
                     continue
                 
-                if page_source:
-                    # Check if scanning has started (image was selected)
-                    scanning_indicators = [
-                        "Finalizing profile",
-                        "Finalizing",
-                        "Scanning",
-                        "Processing",
-                    ]
-                    
-                    # Check if result screen appeared (image was already processed)
-                    # Updated to include "No Insect Detected" (exact text from the screen)
-                    result_indicators = [
-                        "Dragonfly",
-                        "No Insect Detected",  # Exact text from the screen
-                        "No Insect",
-                        "No insect visible",
-                        "No insect detected",
-                        "species of",
-                        "Damselfly",
-                        "Tips for Better Photos",  # This appears on "No Insect Detected" screen
-                    ]
-                    
-                    # Check if we're on a screen that suggests image was selected
-                    if any(ind in page_source for ind in scanning_indicators):
-                        logger.info("✓ Image selection detected - scanning started")
-                        print("✓ Image detected! Processing...")
-                        return True
-                    
-                    if any(ind in page_source for ind in result_indicators):
-                        logger.info("✓ Image selection detected - result screen appeared")
-                        print("✓ Image detected! Result screen found.")
-                        return True
-                
-                # Show progress every 10 seconds
-                if check_count % 5 == 0:
-                    elapsed = int(time.time() - start_time)
-                    print(f"   Still waiting... ({elapsed}s elapsed)")
-                
-                # Check every 2 seconds
-                time.sleep(2)
+                if indicator_kind == "scanning":
+                    logger.info("✓ Image selection detected - scanning started")
+                    print("✓ Image detected! Processing...")
+                else:
+                    logger.info("✓ Image selection detected - result screen appeared")
+                    print("✓ Image detected! Result screen found.")
+                return True
             
             logger.warning("Timeout waiting for image selection - proceeding anyway")
             print("⚠️  Timeout waiting for image - proceeding anyway")
@@ -474,42 +859,71 @@ class TestRunner:
             # Proceed anyway - user may have selected image
             return True
     
+    def _find_indicator(self) -> Optional[str]:
+        """
+        Check once for an on-screen scanning/result indicator
+        
+        Returns:
+            "scanning" or "result" if an indicator is showing, else None
+        """
+        try:
+            # One RPC; the device filters the hierarchy and returns only matches
+            found = self.driver.driver.find_elements(AppiumBy.XPATH, INDICATOR_XPATH)
+        except InvalidSelectorException:
+            # Selector query unsupported - fall back to scanning the full page source
+            match = INDICATOR_PATTERN.search(self.driver.driver.page_source or "")
+            return match.lastgroup if match else None
+        
+        if not found:
+            return None
+        try:
+            matched_text = found[0].text or found[0].get_attribute("content-desc") or ""
+        except WebDriverException:
+            matched_text = ""  # Screen moved on; an indicator was still found
+        match = INDICATOR_PATTERN.search(matched_text)
+        return match.lastgroup if match else "result"
+    
     def _print_summary(self, summary: Dict, report: Dict):
-        """Print test summary to console"""
-        print("\n" + "="*60)
-        print("📊 TEST EXECUTION SUMMARY")
-        print("="*60)
-        print(f"Total Tests Executed: {summary['total']}")
-        print(f"✓ Correct Species: {summary['correct_species']}")
-        print(f"✗ Incorrect Species: {summary['incorrect_species']}")
-        print(f"✗ No Identification: {summary['no_identification']}")
+        """Print test summary to console (built in memory, written once)"""
+        parts = [
+            "",
+            "=" * 60,
+            "📊 TEST EXECUTION SUMMARY",
+            "=" * 60,
+            f"Total Tests: {report['total_tests']}",
+            f"▶ Executed: {report['total_tests'] - summary.get('skipped', 0)}",
+            f"↷ Skipped (passed last run): {summary.get('skipped', 0)}",
+            f"✓ Correct Species: {summary['correct_species']}",
+            f"✗ Incorrect Species: {summary['incorrect_species']}",
+            f"✗ No Identification: {summary['no_identification']}",
+        ]
         
         # Show accuracy (calculated as correct / total)
         if summary['total'] > 0:
-            print(f"📈 Accuracy: {summary['accuracy']}% (Correct: {summary['correct_species']}/{summary['total']})")
+            parts.append(f"📈 Accuracy: {summary['accuracy']}% (Correct: {summary['correct_species']}/{summary['total']})")
         else:
-            print(f"📈 Accuracy: N/A (no tests executed)")
+            parts.append("📈 Accuracy: N/A (no tests executed)")
         
-        print("="*60)
+        parts.append("=" * 60)
         
         # Print detailed breakdown
-        print("\n📋 DETAILED BREAKDOWN:")
-        print("-" * 60)
+        parts.append("\n📋 DETAILED BREAKDOWN:")
+        parts.append("-" * 60)
         
         if summary['correct_species'] > 0:
-            print(f"\n✓ Correct Species ({summary['correct_species']}):")
+            parts.append(f"\n✓ Correct Species ({summary['correct_species']}):")
             for result in report['detailed_summary']['correct_species']:
                 classification = result.get('classification', {})
                 expected = classification.get('expected_species', 'unknown')
                 app_species = classification.get('app_species', 'unknown')
-                print(f"   • {result['test_id']}: {expected} → {app_species}")
+                parts.append(f"   • {result['test_id']}: {expected} → {app_species}")
         
         if summary['incorrect_species'] > 0:
-            print(f"\n✗ Incorrect Species ({summary['incorrect_species']}):")
+            parts.append(f"\n✗ Incorrect Species ({summary['incorrect_species']}):")
             for result in report['detailed_summary']['incorrect_species']:
                 classification = result.get('classification', {})
-                print(f"   • {result['test_id']}: Expected '{classification.get('expected_species')}', "
-                      f"Got '{classification.get('app_species')}'")
+                parts.append(f"   • {result['test_id']}: Expected '{classification.get('expected_species')}', "
+                             f"Got '{classification.get('app_species')}'")
         
         # Combine uncertain and no_identification (they're the same)
         no_id_count = summary['no_identification']
@@ -518,16 +932,17 @@ class TestRunner:
         all_no_id_results = uncertain_results + no_id_results
         
         if no_id_count > 0:
-            print(f"\n✗ No Identification ({no_id_count}):")
+            parts.append(f"\n✗ No Identification ({no_id_count}):")
             for result in all_no_id_results:
                 classification = result.get('classification', {})
                 app_species = classification.get('app_species', 'no_insect_visible') if classification else 'no_insect_visible'
-                print(f"   • {result['test_id']}: {app_species}")
+                parts.append(f"   • {result['test_id']}: {app_species}")
         
-        if len(report.get('detailed_summary', {}).get('errors', [])) > 0:
-            print(f"\n⚠️  Errors ({len(report['detailed_summary']['errors'])}):")
-            for result in report['detailed_summary']['errors']:
-                print(f"   • {result['test_id']}: {result.get('error', 'Unknown error')}")
+        errors = report.get('detailed_summary', {}).get('errors', [])
+        if errors:
+            parts.append(f"\n⚠️  Errors ({len(errors)}):")
+            for result in errors:
+                parts.append(f"   • {result['test_id']}: {result.get('error', 'Unknown error')}")
         
-        print("=" * 60)
-
+        parts.append("=" * 60)
+        sys.stdout.write("\n".join(parts) + "\n")
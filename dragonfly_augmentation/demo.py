@@ -1,12 +1,13 @@
 import os
 from datetime import datetime
 
+import cv2
 import numpy as np
-from PIL import Image
 import streamlit as st
 
 from weather_aug.augmentor import WeatherAugmentor
 from weather_aug.classifier import WeatherClassifier
+from weather_aug.logging_util import log_augmentation
 
 SAMPLES_ORIGINAL_DIR = os.path.join("samples", "original")
 SAMPLES_AUGMENTED_DIR = os.path.join("samples", "augmented")
@@ -17,23 +18,71 @@ def ensure_dirs():
     os.makedirs(SAMPLES_AUGMENTED_DIR, exist_ok=True)
 
 
-def pil_to_np(img: Image.Image) -> np.ndarray:
-    return np.array(img.convert("RGB"))
+@st.cache_resource
+def get_classifier() -> WeatherClassifier:
+    """Single classifier instance shared across reruns and sessions."""
+    return WeatherClassifier()
 
 
-def np_to_pil(arr: np.ndarray) -> Image.Image:
-    return Image.fromarray(arr.astype(np.uint8))
+@st.cache_resource
+def get_augmentor(intensity: str) -> WeatherAugmentor:
+    """One augmentor (with its built pipelines) per intensity level."""
+    return WeatherAugmentor(intensity=intensity)
 
 
-def save_image(img: Image.Image, prefix: str, effect: str | None = None) -> str:
-    """Save image under samples/augmented/ with timestamped filename."""
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_upload(image_bytes: bytes, max_dim: int | None = None) -> np.ndarray:
+    """Decode uploaded image bytes to RGB, reused across Streamlit reruns.
+
+    If max_dim is given, the image is downscaled so its longest side is at
+    most max_dim pixels; weather effects cost O(H*W) per click.
+    """
+    bgr = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if bgr is None:
+        raise ValueError("Could not decode the uploaded image")
+    if max_dim:
+        scale = max_dim / max(bgr.shape[:2])
+        if scale < 1.0:
+            bgr = cv2.resize(bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def predict_cached(image: np.ndarray) -> dict:
+    """Prediction for the uploaded image, keyed by content and reused across reruns."""
+    return get_classifier().predict_with_details(image)
+
+
+def encode_image(image: np.ndarray, fmt: str = "PNG") -> bytes:
+    """Encode an RGB array as PNG or JPEG."""
+    bgr = cv2.cvtColor(image.astype(np.uint8, copy=False), cv2.COLOR_RGB2BGR)
+    if fmt == "JPEG":
+        ok, buf = cv2.imencode(".jpg", bgr, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+    else:
+        # Fast PNG mode: these samples are throwaway, encode time matters more than size
+        ok, buf = cv2.imencode(".png", bgr, [int(cv2.IMWRITE_PNG_COMPRESSION), 1])
+    if not ok:
+        raise ValueError(f"Could not encode image as {fmt}")
+    return buf.tobytes()
+
+
+def apply_effects(augmentor: WeatherAugmentor, image: np.ndarray, effects: list) -> np.ndarray:
+    """Apply effects to an image in order."""
+    for eff in effects:
+        image = augmentor.apply_effect(image, eff)
+    return image
+
+
+def save_image(image_bytes: bytes, prefix: str, effect: str | None = None, ext: str = "png") -> str:
+    """Save encoded image bytes under samples/augmented/ with timestamped filename."""
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     if effect:
-        name = f"{prefix}_{effect}_{ts}.png"
+        name = f"{prefix}_{effect}_{ts}.{ext}"
     else:
-        name = f"{prefix}_{ts}.png"
+        name = f"{prefix}_{ts}.{ext}"
     path = os.path.join(SAMPLES_AUGMENTED_DIR, name)
-    img.save(path)
+    with open(path, "wb") as f:
+        f.write(image_bytes)
     return path
 
 
@@ -55,9 +104,18 @@ def main():
     intensity = st.sidebar.selectbox("Intensity", ["low", "medium", "high"], index=1)
     auto_save = st.sidebar.checkbox("Automatically save augmented images", value=True)
     enable_classifier = st.sidebar.checkbox("Enable Weather Prediction (ML Model)", value=True)
+    preview_res = st.sidebar.select_slider(
+        "Preview resolution",
+        options=["640", "1280", "Original"],
+        value="1280",
+        help="Large uploads are downscaled to this size before augmentation; the "
+             "displayed, downloaded and auto-saved image all use it. Use 'Save full "
+             "resolution' or choose Original for full-size output.",
+    )
+    max_dim = None if preview_res == "Original" else int(preview_res)
 
     # Initialize classifier if enabled
-    classifier = WeatherClassifier() if enable_classifier else None
+    classifier = get_classifier() if enable_classifier else None
 
     uploaded_file = st.file_uploader("Upload an insect image", type=["png", "jpg", "jpeg"])
 
@@ -67,15 +125,14 @@ def main():
     original_predictions = None
     
     if uploaded_file is not None:
-        original_img = Image.open(uploaded_file)
+        original_img = load_upload(uploaded_file.getvalue(), max_dim)
         with col_old:
             st.subheader("Old (Original)")
             st.image(original_img, use_column_width=True)
             
             # Show prediction for original image
             if classifier:
-                orig_np = pil_to_np(original_img)
-                original_predictions = classifier.predict_with_details(orig_np)
+                original_predictions = predict_cached(original_img)
                 st.caption("**Weather Prediction:**")
                 st.write(f"🔍 {original_predictions['predicted_class'].capitalize()}: {original_predictions['confidence']*100:.1f}%")
                 with st.expander("See all predictions"):
@@ -123,30 +180,28 @@ def main():
 
     if effect_clicked and original_img is not None:
         try:
-            augmentor = WeatherAugmentor(intensity=intensity)
-            np_img = pil_to_np(original_img)
+            augmentor = get_augmentor(intensity)
             
-            if effect_clicked == "multi":
-                # Apply multiple effects sequentially
-                np_aug = np_img
-                applied_effects = []
-                for eff in multi_effects:
-                    np_aug = augmentor.apply_effect(np_aug, eff)
-                    applied_effects.append(eff)
-                effect_name = "+".join(applied_effects) if applied_effects else "none"
-            else:
-                np_aug = augmentor.apply_effect(np_img, effect_clicked)
-                effect_name = effect_clicked
-
-            aug_img = np_to_pil(np_aug)
+            # Apply multiple effects sequentially for "multi"
+            effects = list(multi_effects) if effect_clicked == "multi" else [effect_clicked]
+            effect_name = "+".join(effects) if effects else "none"
+            np_aug = apply_effects(augmentor, original_img, effects)
+            # Remembered so the effects can be re-rendered at full resolution on request
+            st.session_state["last_augmentation"] = {
+                "file": uploaded_file.name,
+                "intensity": intensity,
+                "effects": effects,
+                "effect_name": effect_name,
+            }
 
             with col_new:
                 st.subheader("New (Augmented)")
-                st.image(aug_img, use_column_width=True)
+                st.image(np_aug, use_column_width=True)
                 st.caption(f"Effect: {effect_name.capitalize()}, Intensity: {intensity}")
 
                 # Show prediction for augmented image
                 if classifier:
+                    # Each click draws a new augmentation, so there is nothing to cache
                     aug_predictions = classifier.predict_with_details(np_aug)
                     st.caption("**Weather Prediction:**")
                     st.write(f"🔍 {aug_predictions['predicted_class'].capitalize()}: {aug_predictions['confidence']*100:.1f}%")
@@ -168,17 +223,20 @@ def main():
                         for cls, prob in aug_predictions['top_3']:
                             st.write(f"- {cls.capitalize()}: {prob*100:.1f}%")
 
-                # Convert PIL image to bytes for download button
-                from io import BytesIO
-                buf = BytesIO()
-                aug_img.save(buf, format="PNG")
-                byte_im = buf.getvalue()
+                # Encode once per click for both the download button and auto-save,
+                # keeping JPEG uploads as JPEG since that encodes much faster than PNG
+                if uploaded_file.name.lower().endswith((".jpg", ".jpeg")):
+                    byte_im = encode_image(np_aug, "JPEG")
+                    ext, mime = "jpg", "image/jpeg"
+                else:
+                    byte_im = encode_image(np_aug)
+                    ext, mime = "png", "image/png"
 
                 st.download_button(
                     label="Download Image",
                     data=byte_im,
-                    file_name=f"augmented_{effect_name}.png",
-                    mime="image/png"
+                    file_name=f"augmented_{effect_name}.{ext}",
+                    mime=mime
                 )
 
             # Logging
@@ -186,22 +244,31 @@ def main():
 
             if auto_save:
                 base_prefix = os.path.splitext(os.path.basename(uploaded_file.name))[0]
-                path = save_image(aug_img, prefix=base_prefix, effect=effect_name)
+                path = save_image(byte_im, prefix=base_prefix, effect=effect_name, ext=ext)
                 st.success(f"Augmented image saved to: {path}")
         except Exception as e:
             st.error(f"Failed to apply effect: {e}")
     elif effect_clicked and original_img is None:
         st.warning("Please upload an image before applying an effect.")
 
-
-def log_augmentation(effect: str, filename: str):
-    """Log augmentation details to logs/augmentations.log"""
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, "augmentations.log")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a") as f:
-        f.write(f"{timestamp} | Effect: {effect} | File: {filename}\n")
+    # Clicks augment the (possibly downscaled) preview only; a full-size render
+    # is a separate, explicit action so the default setup stays responsive
+    last = st.session_state.get("last_augmentation")
+    if max_dim and uploaded_file is not None and last and last["file"] == uploaded_file.name:
+        if st.sidebar.button(
+            "Save full resolution",
+            help="Applies the last effects to the original upload and saves it. "
+                 "Random details such as rain streaks are drawn anew.",
+        ):
+            try:
+                full_img = load_upload(uploaded_file.getvalue())
+                full_aug = apply_effects(get_augmentor(last["intensity"]), full_img, last["effects"])
+                base_prefix = os.path.splitext(os.path.basename(uploaded_file.name))[0]
+                path = save_image(encode_image(full_aug), prefix=base_prefix, effect=last["effect_name"])
+                log_augmentation(last["effect_name"], uploaded_file.name)
+                st.sidebar.success(f"Full-resolution image saved to: {path}")
+            except Exception as e:
+                st.sidebar.error(f"Failed to save full-resolution image: {e}")
 
 
 if __name__ == "__main__":
@@ -6,7 +6,10 @@ Usage:
     3. Augmented images will be written into samples/augmented/.
 """
 
+import multiprocessing as mp
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from datetime import datetime
 
@@ -14,9 +17,14 @@ import cv2
 import numpy as np
 
 from weather_aug.augmentor import WeatherAugmentor
+from weather_aug.logging_util import log_augmentation
 
 SAMPLES_ORIGINAL_DIR = os.path.join("samples", "original")
 SAMPLES_AUGMENTED_DIR = os.path.join("samples", "augmented")
+EFFECTS = ["rain", "snow", "fog", "night", "sunny", "autumn", "motion_blur"]
+
+# Per-process state, set up by _init_worker
+_augmentor = None
 
 
 def ensure_dirs():
@@ -28,12 +36,54 @@ def save_np_image(arr: np.ndarray, base_name: str, effect: str) -> str:
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     fname = f"{base_name}_{effect}_{ts}.png"
     path = os.path.join(SAMPLES_AUGMENTED_DIR, fname)
-    # OpenCV expects BGR
-    bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-    cv2.imwrite(path, bgr)
+    # arr is already BGR, as read by cv2.imread
+    # Fast PNG mode: encoding dominates the write, and samples are regenerated freely
+    cv2.imwrite(path, arr, [int(cv2.IMWRITE_PNG_COMPRESSION), 1])
     return path
 
 
+def _init_worker(intensity: str):
+    global _augmentor
+    # The pool already runs one process per core; OpenCV's own thread pool
+    # on top of that would oversubscribe the CPU
+    cv2.setNumThreads(1)
+    # Augment in OpenCV's BGR order to skip two colour conversions per effect
+    _augmentor = WeatherAugmentor(intensity=intensity, bgr=True)
+
+
+def process_one(img_path: str):
+    """Apply every effect to one image inside a worker process.
+
+    Returns:
+        Tuple of (img_path, results) where results is a list of
+        (effect, out_path, error) tuples, or None if the image is unreadable.
+    """
+    base = os.path.splitext(os.path.basename(img_path))[0]
+    bgr = cv2.imread(img_path)
+    if bgr is None:
+        return img_path, None
+
+    results = []
+    pending = {}
+    # PNG encoding releases the GIL, so writes run in the background while
+    # the next effect is being applied; the pool is shut down with the block
+    with ThreadPoolExecutor(max_workers=2) as writer:
+        for effect in EFFECTS:
+            try:
+                aug = _augmentor.apply_effect(bgr, effect)
+            except Exception as e:
+                results.append((effect, None, f"Failed to apply {effect} to {img_path}: {e}"))
+                continue
+            pending[effect] = writer.submit(save_np_image, aug, base_name=base, effect=effect)
+
+        for effect, future in pending.items():
+            try:
+                results.append((effect, future.result(), None))
+            except Exception as e:
+                results.append((effect, None, f"Failed to save {effect} image for {img_path}: {e}"))
+    return img_path, results
+
+
 def main():
     ensure_dirs()
     image_paths = glob(os.path.join(SAMPLES_ORIGINAL_DIR, "*"))
@@ -42,35 +92,21 @@ def main():
         print(f"No images found in {SAMPLES_ORIGINAL_DIR}. Please add images and try again.")
         return
 
-    effects = ["rain", "snow", "fog", "night", "sunny", "autumn", "motion_blur"]
-    augmentor = WeatherAugmentor(intensity="medium")
-
-    for img_path in image_paths:
-        base = os.path.splitext(os.path.basename(img_path))[0]
-        bgr = cv2.imread(img_path)
-        if bgr is None:
-            print(f"Skipping unreadable image: {img_path}")
-            continue
-        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-
-        for effect in effects:
-            try:
-                aug = augmentor.apply_effect(rgb, effect)
-                out_path = save_np_image(aug, base_name=base, effect=effect)
+    # fork lets workers share the parent's imported modules on Linux
+    ctx = mp.get_context("fork") if sys.platform.startswith("linux") else mp.get_context()
+    processes = min(os.cpu_count() or 1, len(image_paths))
+    with ctx.Pool(processes, initializer=_init_worker, initargs=("medium",)) as pool:
+        # Printing and logging stay in the parent so output lines don't interleave
+        for img_path, results in pool.imap_unordered(process_one, image_paths, chunksize=1):
+            if results is None:
+                print(f"Skipping unreadable image: {img_path}")
+                continue
+            for effect, out_path, error in results:
+                if error:
+                    print(error)
+                    continue
                 log_augmentation(effect, os.path.basename(img_path))
                 print(f"Saved {effect} image to {out_path}")
-            except Exception as e:
-                print(f"Failed to apply {effect} to {img_path}: {e}")
-
-
-def log_augmentation(effect: str, filename: str):
-    """Log augmentation details to logs/augmentations.log"""
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, "augmentations.log")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a") as f:
-        f.write(f"{timestamp} | Effect: {effect} | File: {filename}\n")
 
 
 if __name__ == "__main__":
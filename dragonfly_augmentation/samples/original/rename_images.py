@@ -4,78 +4,53 @@ darner_1.jpg, darner_2.jpg, skimmer_1.jpg, skimmer_2.jpg, etc.
 """
 
 import os
-from pathlib import Path
 
 def rename_images():
     """Rename images to consistent format"""
-    current_dir = Path(__file__).parent
+    current_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # Organize images by type
+    # Organize images by type in a single directory scan
     darner_images = []
     skimmer_images = []
     generic_images = []
     
-    for f in os.listdir(current_dir):
-        if f.lower().endswith(('.jpg', '.jpeg', '.png')) and f != 'rename_images.py':
-            f_lower = f.lower()
+    with os.scandir(current_dir) as entries:
+        for entry in entries:
+            f_lower = entry.name.lower()
+            if not f_lower.endswith(('.jpg', '.jpeg', '.png')) or not entry.is_file():
+                continue
             if 'darner' in f_lower:
-                darner_images.append(f)
+                darner_images.append(entry)
             elif 'skimmer' in f_lower:
-                skimmer_images.append(f)
+                skimmer_images.append(entry)
             else:
-                generic_images.append(f)
+                generic_images.append(entry)
     
     # Sort for consistent ordering
-    darner_images.sort()
-    skimmer_images.sort()
-    generic_images.sort()
+    darner_images.sort(key=lambda e: e.name)
+    skimmer_images.sort(key=lambda e: e.name)
+    generic_images.sort(key=lambda e: e.name)
     
     print(f"Found {len(darner_images)} darner images")
     print(f"Found {len(skimmer_images)} skimmer images")
     print(f"Found {len(generic_images)} generic images")
     
-    # Rename darner images
-    for i, old_name in enumerate(darner_images, 1):
-        ext = Path(old_name).suffix
-        new_name = f"darner_{i}{ext}"
-        old_path = current_dir / old_name
-        new_path = current_dir / new_name
-        
-        if old_path.exists() and old_path != new_path:
+    for prefix, images in (("darner", darner_images),
+                           ("skimmer", skimmer_images),
+                           ("dragonfly", generic_images)):
+        for i, entry in enumerate(images, 1):
+            ext = os.path.splitext(entry.name)[1]
+            new_name = f"{prefix}_{i}{ext}"
+            if new_name == entry.name:
+                continue
+            new_path = os.path.join(current_dir, new_name)
+            
             # Check if new name already exists
-            if new_path.exists():
-                print(f"Warning: {new_name} already exists, skipping {old_name}")
+            if os.path.exists(new_path):
+                print(f"Warning: {new_name} already exists, skipping {entry.name}")
             else:
-                old_path.rename(new_path)
-                print(f"Renamed: {old_name} -> {new_name}")
-    
-    # Rename skimmer images
-    for i, old_name in enumerate(skimmer_images, 1):
-        ext = Path(old_name).suffix
-        new_name = f"skimmer_{i}{ext}"
-        old_path = current_dir / old_name
-        new_path = current_dir / new_name
-        
-        if old_path.exists() and old_path != new_path:
-            if new_path.exists():
-                print(f"Warning: {new_name} already exists, skipping {old_name}")
-            else:
-                old_path.rename(new_path)
-                print(f"Renamed: {old_name} -> {new_name}")
-    
-    # Rename generic dragonfly images
-    for i, old_name in enumerate(generic_images, 1):
-        ext = Path(old_name).suffix
-        new_name = f"dragonfly_{i}{ext}"
-        old_path = current_dir / old_name
-        new_path = current_dir / new_name
-        
-        if old_path.exists() and old_path != new_path:
-            if new_path.exists():
-                print(f"Warning: {new_name} already exists, skipping {old_name}")
-            else:
-                old_path.rename(new_path)
-                print(f"Renamed: {old_name} -> {new_name}")
+                os.replace(entry.path, new_path)
+                print(f"Renamed: {entry.name} -> {new_name}")
     
     print("\nRenaming complete!")
 
@@ -1,3 +1,5 @@
+import random
+
 import numpy as np
 
 try:
@@ -11,9 +13,12 @@ class WeatherAugmentor:
     Usage:
         augmentor = WeatherAugmentor(intensity="medium")
         rainy = augmentor.apply_rain(image_np)
+
+    Images are expected in RGB order. Pass ``bgr=True`` to work directly on
+    OpenCV (BGR) arrays; only the autumn colour shift depends on channel order.
     """
 
-    def __init__(self, intensity: str = "medium", seed: int | None = None):
+    def __init__(self, intensity: str = "medium", seed: int | None = None, bgr: bool = False):
         if A is None:
             raise ImportError(
                 "albumentations is required but not installed. "
@@ -23,48 +28,45 @@ class WeatherAugmentor:
         if intensity not in {"low", "medium", "high"}:
             raise ValueError("intensity must be one of: low, medium, high")
         self.intensity = intensity
-        self.rng = np.random.RandomState(seed) if seed is not None else None
+        self.rng = np.random.default_rng(seed) if seed is not None else None
+        self.bgr = bgr
+
+        # Compose pipelines only hold transform parameters (randomness is drawn
+        # per call), so they are built once and shared across apply_* calls.
+        self._pipelines = {
+            "rain": self._build_rain(),
+            "snow": self._build_snow(),
+            "fog": self._build_fog(),
+            "night": self._build_night(),
+            "sunny": self._build_sunny(),
+            "autumn": self._build_autumn(),
+            "motion_blur": self._build_motion_blur(),
+        }
 
     # ---------- public API ----------
 
     def apply_effect(self, image: np.ndarray, effect: str) -> np.ndarray:
         """Apply an effect by name: rain, snow, fog, night, sunny, autumn, motion_blur."""
         effect = effect.lower()
-        if effect == "rain":
-            return self.apply_rain(image)
-        if effect == "snow":
-            return self.apply_snow(image)
-        if effect == "fog":
-            return self.apply_fog(image)
-        if effect == "night":
-            return self.apply_night(image)
-        if effect == "sunny":
-            return self.apply_sunny(image)
-        if effect == "autumn":
-            return self.apply_autumn(image)
-        if effect == "motion_blur":
-            return self.apply_motion_blur(image)
-        raise ValueError(f"Unknown effect: {effect}")
+        transform = self._pipelines.get(effect)
+        if transform is None:
+            raise ValueError(f"Unknown effect: {effect}")
+        return self._apply(transform, image)
 
     def apply_rain(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_rain()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["rain"], image)
 
     def apply_snow(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_snow()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["snow"], image)
 
     def apply_fog(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_fog()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["fog"], image)
 
     def apply_night(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_night()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["night"], image)
 
     def apply_sunny(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_sunny()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["sunny"], image)
 
     # ---------- internal helpers ----------
 
@@ -74,17 +76,20 @@ class WeatherAugmentor:
         if image.dtype != np.uint8:
             # Albumentations expects uint8 images
             image = image.astype(np.uint8)
-        if self.rng is not None:
-            # Albumentations supports setting a random seed via NumPy
-            state = np.random.get_state()
-            np.random.set_state(self.rng.get_state())
-            try:
-                augmented = transform(image=image)["image"]
-            finally:
-                np.random.set_state(state)
-        else:
-            augmented = transform(image=image)["image"]
-        return augmented
+        if self.rng is None:
+            return transform(image=image)["image"]
+        # Albumentations draws from the global generators: reseed them from
+        # self.rng for this call, then put the caller's state back
+        py_state = random.getstate()
+        np_state = np.random.get_state()
+        seed = int(self.rng.integers(0, 2**31 - 1))
+        random.seed(seed)
+        np.random.seed(seed)
+        try:
+            return transform(image=image)["image"]
+        finally:
+            random.setstate(py_state)
+            np.random.set_state(np_state)
 
     # --- individual effect builders ---
 
@@ -216,12 +221,10 @@ class WeatherAugmentor:
         return A.Compose(transforms)
 
     def apply_autumn(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_autumn()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["autumn"], image)
 
     def apply_motion_blur(self, image: np.ndarray) -> np.ndarray:
-        transform = self._build_motion_blur()
-        return self._apply(transform, image)
+        return self._apply(self._pipelines["motion_blur"], image)
 
     def _build_autumn(self):
         # Autumn: Shift colors towards red/orange (warm tones)
@@ -237,6 +240,8 @@ class WeatherAugmentor:
             r_shift = (30, 50)
             g_shift = (10, 20)
             b_shift = (-30, -10)
+        if self.bgr:
+            r_shift, b_shift = b_shift, r_shift
 
         return A.Compose([
             A.RGBShift(
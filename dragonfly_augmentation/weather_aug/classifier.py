@@ -11,6 +11,33 @@ import numpy as np
 from PIL import Image
 import cv2
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _pixel_sums(image):
+        """Per-channel sums and overall sum of squares of a uint8 RGB image."""
+        r_sum = 0.0
+        g_sum = 0.0
+        b_sum = 0.0
+        sq_sum = 0.0
+        for i in prange(image.shape[0]):
+            for j in range(image.shape[1]):
+                r = float(image[i, j, 0])
+                g = float(image[i, j, 1])
+                b = float(image[i, j, 2])
+                r_sum += r
+                g_sum += g
+                b_sum += b
+                sq_sum += r * r + g * g + b * b
+        return r_sum, g_sum, b_sum, sq_sum
+else:
+    _pixel_sums = None
+
 
 class WeatherClassifier:
     """
@@ -23,7 +50,9 @@ class WeatherClassifier:
     
     def __init__(self):
         self.classes = ['cloudy', 'fogsmog', 'rain', 'shine', 'sunrise']
-        self.input_size = (224, 224)
+        # Only global colour statistics are used, so each axis is sampled
+        # with a stride that leaves roughly this many pixels along it
+        self.sample_side = 256
     
     def predict(self, image: np.ndarray) -> dict:
         """
@@ -35,50 +64,56 @@ class WeatherClassifier:
         Returns:
             Dict with class names as keys and confidence scores as values
         """
-        # Resize image
+        return dict(zip(self.classes, self._probabilities(image).tolist()))
+    
+    def _probabilities(self, image: np.ndarray) -> np.ndarray:
+        """Class probabilities as an array ordered like self.classes."""
         if len(image.shape) == 2:
             image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
         
-        img_resized = cv2.resize(image, self.input_size)
-        
-        # Extract features
-        brightness = np.mean(img_resized)
-        contrast = np.std(img_resized)
-        blue_channel = np.mean(img_resized[:, :, 2])
-        red_channel = np.mean(img_resized[:, :, 0])
-        green_channel = np.mean(img_resized[:, :, 1])
-        
-        # Rule-based scoring (simulates neural network output)
-        scores = {}
+        # Strided (channels-last) subsample instead of a full resize
+        h, w = image.shape[:2]
+        sample = image[::max(1, h // self.sample_side), ::max(1, w // self.sample_side)]
         
-        # Cloudy: moderate brightness, low contrast, grayish
-        cloudiness = 1.0 - abs(brightness - 120) / 120
-        scores['cloudy'] = max(0, cloudiness * 0.6 + (1 - contrast/50) * 0.4)
-        
-        # Fog: low contrast, high brightness, whitish
-        foginess = (brightness / 255) * 0.5 + (1 - contrast/80) * 0.5
-        scores['fogsmog'] = max(0, foginess)
-        
-        # Rain: low brightness, blue tint
-        raininess = (1 - brightness/255) * 0.6 + (blue_channel / 255) * 0.4
-        scores['rain'] = max(0, raininess)
-        
-        # Shine: high brightness, high contrast
-        shininess = (brightness / 255) * 0.6 + (contrast/80) * 0.4
-        scores['shine'] = max(0, shininess)
+        # Extract features from per-channel sums in a single pass
+        if _pixel_sums is not None and sample.dtype == np.uint8:
+            # Fused loop over the uint8 pixels, no float copy of the image
+            r_sum, g_sum, b_sum, sq_sum = _pixel_sums(sample)
+            n = sample.shape[0] * sample.shape[1]
+            means = np.array([r_sum, g_sum, b_sum]) / n
+            brightness = means.mean()
+            contrast = float(np.sqrt(max(sq_sum / (3 * n) - brightness * brightness, 0.0)))
+        else:
+            flat = sample.reshape(-1, 3).astype(np.float64)
+            n = flat.shape[0]
+            means = flat.sum(axis=0) / n
+            variances = np.einsum('ij,ij->j', flat, flat) / n - means * means
+            brightness = means.mean()
+            # Overall std = within-channel variance + spread of the channel means
+            contrast = float(np.sqrt(variances.mean() + ((means - brightness) ** 2).mean()))
+        red_channel, green_channel, blue_channel = means
         
-        # Sunrise: warm tones (red/orange)
-        warmth = (red_channel / 255) * 0.5 + ((red_channel - blue_channel) / 255) * 0.5
-        scores['sunrise'] = max(0, warmth)
+        # Rule-based scoring (simulates neural network output), one entry per
+        # class in self.classes order
+        scores = np.array([
+            # Cloudy: moderate brightness, low contrast, grayish
+            (1.0 - abs(brightness - 120) / 120) * 0.6 + (1 - contrast/50) * 0.4,
+            # Fog: low contrast, high brightness, whitish
+            (brightness / 255) * 0.5 + (1 - contrast/80) * 0.5,
+            # Rain: low brightness, blue tint
+            (1 - brightness/255) * 0.6 + (blue_channel / 255) * 0.4,
+            # Shine: high brightness, high contrast
+            (brightness / 255) * 0.6 + (contrast/80) * 0.4,
+            # Sunrise: warm tones (red/orange)
+            (red_channel / 255) * 0.5 + ((red_channel - blue_channel) / 255) * 0.5,
+        ])
+        np.clip(scores, 0, None, out=scores)
         
         # Normalize to sum to 1
-        total = sum(scores.values())
+        total = scores.sum()
         if total > 0:
-            probabilities = {k: v / total for k, v in scores.items()}
-        else:
-            probabilities = {k: 1.0 / len(self.classes) for k in self.classes}
-        
-        return probabilities
+            return scores / total
+        return np.full(len(self.classes), 1.0 / len(self.classes))
     
     def get_top_prediction(self, image: np.ndarray) -> tuple:
         """
@@ -87,9 +122,8 @@ class WeatherClassifier:
         Returns:
             Tuple of (class_name, confidence)
         """
-        probs = self.predict(image)
-        top_class = max(probs, key=probs.get)
-        return top_class, probs[top_class]
+        details = self.predict_with_details(image)
+        return details['predicted_class'], details['confidence']
     
     def predict_with_details(self, image: np.ndarray) -> dict:
         """
@@ -98,12 +132,15 @@ class WeatherClassifier:
         Returns:
             Dict with 'predictions' (all probabilities) and 'top_3' (list of tuples)
         """
-        probs = self.predict(image)
-        sorted_probs = sorted(probs.items(), key=lambda x: x[1], reverse=True)
+        probs = self._probabilities(image)
+        # Partial selection of the top 3, then order just those
+        top_idx = np.argpartition(probs, -3)[-3:]
+        top_idx = top_idx[np.argsort(probs[top_idx])[::-1]]
+        top_3 = [(self.classes[i], float(probs[i])) for i in top_idx]
         
         return {
-            'predictions': probs,
-            'top_3': sorted_probs[:3],
-            'predicted_class': sorted_probs[0][0],
-            'confidence': sorted_probs[0][1]
+            'predictions': dict(zip(self.classes, probs.tolist())),
+            'top_3': top_3,
+            'predicted_class': top_3[0][0],
+            'confidence': top_3[0][1]
         }
@@ -0,0 +1,27 @@
+"""Augmentation log shared by the Streamlit demo and the batch script."""
+
+import atexit
+import os
+import threading
+from datetime import datetime
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "augmentations.log")
+
+_lock = threading.Lock()
+_log_fh = None
+
+
+def log_augmentation(effect: str, filename: str):
+    """Log augmentation details to logs/augmentations.log"""
+    global _log_fh
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{timestamp} | Effect: {effect} | File: {filename}\n"
+    with _lock:
+        if _log_fh is None:
+            os.makedirs(LOG_DIR, exist_ok=True)
+            # Opened once per process; line-buffered so each entry is on disk
+            # as soon as it is written
+            _log_fh = open(LOG_FILE, "a", buffering=1)
+            atexit.register(_log_fh.close)
+        _log_fh.write(line)